@@ -70,19 +70,44 @@ CONSOLE_LOG_COLOR_GREEN = "\x1b[1;32;5;197m"
 CONSOLE_LOG_COLOR_RED = "\x1b[1;38;5;197m"
 CONSOLE_LOG_COLOR_RESET = "\x1b[0m"
 
+# Precompiled patterns matched against every incoming LAVA log line
+HWCI_RESULT_REGEX = re.compile(r"hwci: mesa: (\S*)")
+MANGLED_COLOR_REGEX = re.compile(r"(\[\d{1,2}m)")
+MANGLED_SECTION_REGEX = re.compile(r"\[0K(section_\w+):(\d+):(\S+)\[0K([\S ]+)?")
+
+# LAVA log levels which are not forwarded to the job output
+HIDDEN_LOG_LEVELS = frozenset(("results", "feedback"))
+
+# Prefix and suffix wrapping the messages of the remaining LAVA log levels
+LOG_LEVEL_DECORATIONS = {
+    "warning": (CONSOLE_LOG_COLOR_RED, CONSOLE_LOG_COLOR_RESET),
+    "error": (CONSOLE_LOG_COLOR_RED, CONSOLE_LOG_COLOR_RESET),
+    "input": ("$ ", ""),
+}
+
 
 def print_log(msg):
     # Reset color from timestamp, since `msg` can tint the terminal color
     print(f"{CONSOLE_LOG_COLOR_RESET}{datetime.now()}: {msg}")
 
 
+def print_log_lines(lines):
+    # Same as print_log, but stamps and emits the whole batch in a single write
+    now = datetime.now()
+    sys.stdout.write("".join(f"{CONSOLE_LOG_COLOR_RESET}{now}: {line}\n" for line in lines))
+
+
 def fatal_err(msg):
-    print_log(msg)
+    print_log(f"{CONSOLE_LOG_COLOR_RED}{msg}{CONSOLE_LOG_COLOR_RESET}")
     sys.exit(1)
 
 
 def hide_sensitive_data(yaml_data, hide_tag="HIDEME"):
-    return "".join(line for line in yaml_data.splitlines(True) if hide_tag not in line)
+    # Common case: nothing was tagged, avoid touching the data at all
+    if hide_tag not in yaml_data:
+        return yaml_data
+    # Drop every tagged line, including its line break, in a single pass
+    return re.sub(rf"^.*{re.escape(hide_tag)}.*\n?", "", yaml_data, flags=re.MULTILINE)
 
 
 def generate_lava_yaml(args):
@@ -243,6 +268,16 @@ def _call_proxy(fn, *args):
 class LAVAJob:
     color_status_map = {"pass": CONSOLE_LOG_COLOR_GREEN}
 
+    __slots__ = (
+        "job_id",
+        "proxy",
+        "definition",
+        "last_log_line",
+        "last_log_time",
+        "is_finished",
+        "status",
+    )
+
     def __init__(self, proxy, definition):
         self.job_id = None
         self.proxy = proxy
@@ -311,9 +346,11 @@ class LAVAJob:
         Returns true only the job finished by looking into the log result
         parsing.
         """
-        log_lines = [l["msg"] for l in lava_lines if l["lvl"] == "target"]
-        for line in log_lines:
-            if result := re.search(r"hwci: mesa: (\S*)", line):
+        for line in lava_lines:
+            msg = line["msg"]
+            if line["lvl"] != "target" or "hwci: mesa: " not in msg:
+                continue
+            if result := HWCI_RESULT_REGEX.search(msg):
                 self.is_finished = True
                 self.status = result.group(1)
                 color = LAVAJob.color_status_map.get(self.status, CONSOLE_LOG_COLOR_RED)
@@ -378,7 +415,10 @@ def fix_lava_color_log(line):
     before `[:digit::digit:?m` ANSI TTY color codes. When this problem is fixed
     on the LAVA side, one should remove this function.
     """
-    line["msg"] = re.sub(r"(\[\d{1,2}m)", "\x1b" + r"\1", line["msg"])
+    # Most lines carry no color codes at all, skip the regex engine for them
+    if "[" not in line["msg"]:
+        return
+    line["msg"] = MANGLED_COLOR_REGEX.sub("\x1b" + r"\1", line["msg"])
 
 
 def fix_lava_gitlab_section_log(line):
@@ -392,7 +432,10 @@ def fix_lava_gitlab_section_log(line):
     incorrectly. When this problem is fixed on the LAVA side, one should remove
     this function.
     """
-    if match := re.match(r"\[0K(section_\w+):(\d+):(\S+)\[0K([\S ]+)?", line["msg"]):
+    # Cheap literal check before running the anchored section regex
+    if not line["msg"].startswith("[0Ksection_"):
+        return
+    if match := MANGLED_SECTION_REGEX.match(line["msg"]):
         marker, timestamp, id_collapsible, header = match.groups()
         # The above regex serves for both section start and end lines.
         # When the header is None, it means we are dealing with `section_end` line
@@ -403,21 +446,14 @@ def fix_lava_gitlab_section_log(line):
 def parse_lava_lines(new_lines) -> list[str]:
     parsed_lines: list[str] = []
     for line in new_lines:
-        prefix = ""
-        suffix = ""
-
-        if line["lvl"] in ["results", "feedback"]:
+        lvl = line["lvl"]
+        if lvl in HIDDEN_LOG_LEVELS:
             continue
-        elif line["lvl"] in ["warning", "error"]:
-            prefix = CONSOLE_LOG_COLOR_RED
-            suffix = CONSOLE_LOG_COLOR_RESET
-        elif line["lvl"] == "input":
-            prefix = "$ "
-            suffix = ""
-        elif line["lvl"] == "target":
+        elif lvl == "target":
             fix_lava_color_log(line)
             fix_lava_gitlab_section_log(line)
 
+        prefix, suffix = LOG_LEVEL_DECORATIONS.get(lvl, ("", ""))
         line = f'{prefix}{line["msg"]}{suffix}'
         parsed_lines.append(line)
 
@@ -453,8 +489,7 @@ def fetch_logs(job, max_idle_time) -> None:
 
     parsed_lines = parse_lava_lines(new_log_lines)
 
-    for line in parsed_lines:
-        print_log(line)
+    print_log_lines(parsed_lines)
 
     job.parse_job_result_from_log(new_log_lines)
 
@@ -306,6 +306,11 @@ SENSITIVE_DATA_SCENARIOS = {
         ["bla  bla"],
         "HIDEME",
     ),
+    "sensitive data tagged in several lines": (
+        ["mytoken: asdkfjsde1341== # HIDEME", "bla  bla", "other: token # HIDEME"],
+        ["bla  bla"],
+        "HIDEME",
+    ),
     "sensitive data tagged with custom word": (
         ["bla  bla", "mytoken: asdkfjsde1341== # DELETETHISLINE", "third line"],
         ["bla  bla", "third line"],
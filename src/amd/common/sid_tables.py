@@ -33,7 +33,8 @@ import re
 import sys
 
 AMD_REGISTERS = os.path.abspath(os.path.join(os.path.dirname(sys.argv[0]), "../registers"))
-sys.path.append(AMD_REGISTERS)
+if AMD_REGISTERS not in sys.path:
+    sys.path.insert(0, AMD_REGISTERS)
 
 from regdb import Object, RegisterDatabase
 
@@ -26,8 +26,25 @@ template = """/*
 
 #include "agx_compiler.h"
 
+/* Sources are allocated inline, directly after the instruction, so building an
+ * instruction costs a single ralloc regardless of its number of sources.
+ */
 static inline agx_instr *
-agx_alloc_instr(agx_builder *b, enum agx_opcode op)
+agx_alloc_instr(agx_builder *b, enum agx_opcode op, unsigned nr_srcs)
+{
+   size_t size = sizeof(agx_instr) + sizeof(agx_index) * nr_srcs;
+   agx_instr *I = (agx_instr *) rzalloc_size(b->shader, size);
+   I->op = op;
+   I->nr_srcs = nr_srcs;
+   I->src = (agx_index *) (I + 1);
+   return I;
+}
+
+/* Specialization of agx_alloc_instr for opcodes without sources, which do not
+ * need the size computation or a source pointer.
+ */
+static inline agx_instr *
+agx_alloc_instr_no_srcs(agx_builder *b, enum agx_opcode op)
 {
    agx_instr *I = rzalloc(b->shader, agx_instr);
    I->op = op;
@@ -59,19 +76,24 @@ agx_${opcode}${suffix}(agx_builder *b
 % endfor
 
 ) {
-   agx_instr *I = agx_alloc_instr(b, AGX_OPCODE_${opcode.upper()});
-
-% for dest in range(dests):
-   I->dest[${dest}] = dst${dest};
-% endfor
+% if srcs == 0:
+   agx_instr *I = agx_alloc_instr_no_srcs(b, AGX_OPCODE_${opcode.upper()});
+% else:
+   agx_instr *I = agx_alloc_instr(b, AGX_OPCODE_${opcode.upper()}, ${srcs});
+% endif
 
-% if srcs > 0:
-   I->src = ralloc_array(I, agx_index, ${srcs});
-   I->nr_srcs = ${srcs};
+% if dests > 1:
+   agx_index dests[] = { ${", ".join("dst" + str(i) for i in range(dests))} };
+   memcpy(I->dest, dests, sizeof(dests));
+% elif dests == 1:
+   I->dest[0] = dst0;
+% endif
 
-% for src in range(srcs):
-   I->src[${src}] = src${src};
-% endfor
+% if srcs > 1:
+   agx_index srcs[] = { ${", ".join("src" + str(i) for i in range(srcs))} };
+   memcpy(I->src, srcs, sizeof(srcs));
+% elif srcs == 1:
+   I->src[0] = src0;
 % endif
 
 % for imm in imms:
@@ -155,7 +177,9 @@ agx_ushr(agx_builder *b, agx_index s0, agx_index s1)
 #endif
 """
 
+import sys
 from mako.template import Template
 from agx_opcodes import opcodes
 
-print(Template(template).render(opcodes=opcodes))
+# Render straight to UTF-8 and hand the whole header to stdout in one write
+sys.stdout.buffer.write(Template(template, output_encoding="utf-8").render(opcodes=opcodes))
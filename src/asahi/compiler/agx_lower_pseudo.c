@@ -32,9 +32,13 @@ agx_lower_to_unary_bitop(agx_instr *I, enum agx_bitop_table table)
    I->op = AGX_OPCODE_BITOP;
    I->truth_table = table;
 
-   /* Allocate extra source */
-   I->src = reralloc_array_size(I, I->src, sizeof(agx_index), I->nr_srcs++);
-   I->src[1] = agx_zero();
+   /* Allocate extra source. The original sources live inline after the
+    * instruction, so they cannot be reallocated in place.
+    */
+   agx_index *src = ralloc_array(I, agx_index, I->nr_srcs + 1);
+   memcpy(src, I->src, sizeof(agx_index) * I->nr_srcs);
+   I->src = src;
+   I->src[I->nr_srcs++] = agx_zero();
 }
 
 static void